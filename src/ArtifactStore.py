@@ -0,0 +1,195 @@
+import abc
+import os
+import re
+from typing import Optional
+from config import ARTIFACT_STORE_BACKEND, ARTIFACT_STORE_DIR, ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_MAX_ENTRIES, \
+    ARTIFACT_S3_BUCKET, ARTIFACT_S3_PREFIX, ARTIFACT_S3_ENDPOINT_URL, ARTIFACT_S3_REGION, ARTIFACT_S3_ACCESS_KEY, \
+    ARTIFACT_S3_SECRET_KEY
+
+ARTIFACT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def validate_artifact_id(artifact_id: str) -> None:
+    """
+    Raises an exception if the given artifact id could be used to escape the storage location.
+
+    :param artifact_id: the identifier of the artifact (the generation id)
+    """
+    if not ARTIFACT_ID_PATTERN.match(artifact_id):
+        raise ValueError(f"Invalid artifact identifier: '{artifact_id}'.")
+
+
+class ArtifactStore(abc.ABC):
+    @abc.abstractmethod
+    def put(self, artifact_id: str, content: bytes) -> None:
+        """
+        Persists the archive of a generation.
+
+        :param artifact_id: the identifier of the artifact (the generation id)
+        :param content: the zipped generated code
+        """
+        pass
+
+    @abc.abstractmethod
+    def get(self, artifact_id: str) -> Optional[bytes]:
+        """
+        Returns the archive of a generation or None if there is no artifact with the given id.
+
+        :param artifact_id: the identifier of the artifact (the generation id)
+        """
+        pass
+
+
+class LocalArtifactStore(ArtifactStore):
+    def __init__(self, directory: str):
+        """
+        :param directory: the directory in which the archives are kept
+        """
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path_of(self, artifact_id: str) -> str:
+        validate_artifact_id(artifact_id)
+        return os.path.join(self.directory, f"{artifact_id}.zip")
+
+    def put(self, artifact_id: str, content: bytes) -> None:
+        path = self.path_of(artifact_id)
+        temp_path = f"{path}.tmp"
+
+        # write then rename, so concurrent readers never see a partially written archive
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def get(self, artifact_id: str) -> Optional[bytes]:
+        path = self.path_of(artifact_id)
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class S3ArtifactStore(ArtifactStore):
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 client=None):
+        """
+        :param bucket: the name of the bucket in which the archives are kept
+        :param prefix: a prefix prepended to every object key
+        :param endpoint_url: the endpoint of an S3-compatible service (e.g. MinIO); None means AWS S3
+        :param region: the region of the bucket
+        :param access_key: the access key id (None means the default boto3 credential chain is used)
+        :param secret_key: the secret access key
+        :param client: an already configured S3 client (boto3 compatible); when given, the other connection
+        parameters are ignored
+        """
+        self.bucket = bucket
+        self.prefix = prefix
+
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise ImportError("The 's3' artifact store backend requires boto3 to be installed.")
+
+            client = boto3.client("s3",
+                                  endpoint_url=endpoint_url,
+                                  region_name=region,
+                                  aws_access_key_id=access_key,
+                                  aws_secret_access_key=secret_key)
+        self.client = client
+
+    def key_of(self, artifact_id: str) -> str:
+        validate_artifact_id(artifact_id)
+        return f"{self.prefix}{artifact_id}.zip"
+
+    def put(self, artifact_id: str, content: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket,
+                               Key=self.key_of(artifact_id),
+                               Body=content,
+                               ContentType="application/x-zip-compressed")
+
+    def get(self, artifact_id: str) -> Optional[bytes]:
+        key = self.key_of(artifact_id)
+
+        try:
+            s3_object = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+        return s3_object["Body"].read()
+
+
+class CachedArtifactStore(ArtifactStore):
+    def __init__(self, backend: ArtifactStore, cache: LocalArtifactStore, max_entries: int = 64):
+        """
+        Read-through cache in front of a (remote) artifact store. Recently used archives are kept on the local disk.
+
+        :param backend: the store that holds every artifact (shared between all nodes)
+        :param cache: the local store used as cache
+        :param max_entries: the maximum number of archives kept in the cache
+        """
+        self.backend = backend
+        self.cache = cache
+        self.max_entries = max_entries
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used archives from the cache, so it does not hold more than max_entries.
+        """
+        entries = [os.path.join(self.cache.directory, name) for name in os.listdir(self.cache.directory)
+                   if name.endswith(".zip")]
+
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=os.path.getatime)
+        for path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def put(self, artifact_id: str, content: bytes) -> None:
+        self.backend.put(artifact_id, content)
+        self.cache.put(artifact_id, content)
+        self.evict()
+
+    def get(self, artifact_id: str) -> Optional[bytes]:
+        content = self.cache.get(artifact_id)
+
+        if content is not None:
+            # reads do not always update the access time (noatime mounts), so it is refreshed explicitly
+            os.utime(self.cache.path_of(artifact_id))
+            return content
+
+        content = self.backend.get(artifact_id)
+
+        if content is not None:
+            self.cache.put(artifact_id, content)
+            self.evict()
+
+        return content
+
+
+def create_artifact_store(project_root: str) -> ArtifactStore:
+    """
+    Creates the artifact store configured through the environment (see config.py).
+
+    :param project_root: the root of the project - relative storage directories are resolved against it
+    """
+    if ARTIFACT_STORE_BACKEND == "local":
+        return LocalArtifactStore(os.path.join(project_root, ARTIFACT_STORE_DIR))
+    elif ARTIFACT_STORE_BACKEND == "s3":
+        backend = S3ArtifactStore(bucket=ARTIFACT_S3_BUCKET,
+                                  prefix=ARTIFACT_S3_PREFIX,
+                                  endpoint_url=ARTIFACT_S3_ENDPOINT_URL,
+                                  region=ARTIFACT_S3_REGION,
+                                  access_key=ARTIFACT_S3_ACCESS_KEY,
+                                  secret_key=ARTIFACT_S3_SECRET_KEY)
+        cache = LocalArtifactStore(os.path.join(project_root, ARTIFACT_CACHE_DIR))
+        return CachedArtifactStore(backend, cache, ARTIFACT_CACHE_MAX_ENTRIES)
+
+    raise ValueError(f"Unknown artifact store backend: '{ARTIFACT_STORE_BACKEND}'.")
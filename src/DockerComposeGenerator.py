@@ -1,35 +1,85 @@
 from Generator import ResourceBasedGenerator
-from typing import List
-from view import Options
+from typing import Tuple
+from IntermediateRepresentation import ResourceIR
+from view import Options, DatabaseOptions
+
+# connections kept available for administration and monitoring, on top of the ones of the application
+RESERVED_DB_CONNECTIONS = 10
+
+
+def database_tuning(db_options: DatabaseOptions):
+    """
+    Returns the settings of the database server that fit the expected data size and the memory budget (None if
+    neither of them was given). The memory sizes are in MB.
+
+    MariaDB: the InnoDB buffer pool gets 70% of the budget, but never more than the data (and its indexes) needs, the
+    redo log a quarter of the buffer pool. Every worker of the application can open pool_size + max_overflow
+    connections. MongoDB: the WiredTiger cache gets half of the budget minus 1 GB (its own default formula), but never
+    more than the data needs.
+
+    :param db_options: the settings of the database (as a Pydantic model)
+    """
+    budget = db_options.memory_budget_mb
+    data_size = db_options.expected_data_size_mb
+
+    if not db_options.server_tuning_enabled:
+        return None
+
+    if db_options.db_type == "MariaDB":
+        limits = [budget * 0.7] if budget is not None else []
+        limits += [data_size * 1.25] if data_size is not None else []
+        buffer_pool = max(128, int(min(limits)))
+        connections = db_options.expected_app_workers * (db_options.pool_size + db_options.max_overflow)
+
+        return {
+            "innodb_buffer_pool_size": buffer_pool,
+            "innodb_log_file_size": min(2048, max(48, buffer_pool // 4)),
+            "max_connections": connections + RESERVED_DB_CONNECTIONS
+        }
+
+    limits = [(budget - 1024) * 0.5] if budget is not None else []
+    limits += [data_size * 1.25] if data_size is not None else []
+
+    return {
+        "wired_tiger_cache_size_gb": round(max(0.25, min(limits) / 1024), 2)
+    }
 
 
 class DockerComposeGenerator(ResourceBasedGenerator):
-    def __init__(self, resources: List[dict], generation_uid, options: Options):
+    def __init__(self, resources: Tuple[ResourceIR, ...], generation_uid, options: Options):
         """
         :param resources: the list of resources defined by the user
         :param generation_uid: the identifier of the generation, used to group the source code in a directory
         :param options: the document containing the settings of the generated application (as a Pydantic model)
         """
         super().__init__(resources, generation_uid)
-        self.redis_needed = False
+        self.redis_needed = any(resource.options.api_caching_enabled for resource in resources)
         self.application_port = options.application_port
         self.docker_compose_template = self.read_template_from_file('docker_compose.jinja2')
-
-        for resource in resources:
-            if resource.get("options").get("api_caching_enabled"):
-                self.redis_needed = True
-                break
+        self.mariadb_config_template = self.read_template_from_file('mariadb_cnf.jinja2')
 
         self.db_options = options.database_options
         self.main_app_in_container = options.run_main_app_in_container
+        self.tuning = database_tuning(self.db_options)
+
+    def manifest(self):
+        files = [('docker-compose.yml', self.estimate_size(self.docker_compose_template))]
+        if self.tuning and self.db_options.db_type == "MariaDB":
+            files.append(('mariadb.cnf', self.estimate_size(self.mariadb_config_template)))
+        return files
 
     def generate(self):
         """
         The method triggers the generation of the docker-compose.yml file. It instantiates the template and then
-        saves the resulted code on the disk.
+        saves the resulted code on the disk. The settings of a tuned MariaDB server are written to mariadb.cnf, which
+        is mounted in its container.
         """
         docker_compose_code = self.docker_compose_template.render(redis_needed=self.redis_needed,
                                                                   options=self.db_options,
+                                                                  tuning=self.tuning,
                                                                   application_port=self.application_port,
                                                                   main_app_in_container=self.main_app_in_container)
         self.write_to_gen_path('docker-compose.yml', docker_compose_code)
+
+        if self.tuning and self.db_options.db_type == "MariaDB":
+            self.write_to_gen_path('mariadb.cnf', self.mariadb_config_template.render(tuning=self.tuning))
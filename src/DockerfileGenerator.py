@@ -1,6 +1,9 @@
 from Generator import ResourceBasedGenerator
 from view import Options
 
+# the files of the source directory that are not copied into the slim image
+DOCKERIGNORE_PATTERNS = ["Dockerfile", ".dockerignore", "**/__pycache__", "**/*.pyc", ".venv", "venv", ".env"]
+
 
 class DockerfileGenerator(ResourceBasedGenerator):
     def __init__(self, resources, generation_uid, options: Options):
@@ -11,12 +14,26 @@ class DockerfileGenerator(ResourceBasedGenerator):
         """
         super().__init__(resources, generation_uid)
         self.application_port = options.application_port
+        self.production = options.deployment_profile == "production"
+        self.slim_image = options.slim_container_image
         self.mongo_model_template = self.read_template_from_file('dockerfile.jinja2')
 
+    def manifest(self):
+        files = [('src/Dockerfile', self.estimate_size(self.mongo_model_template))]
+        if self.slim_image:
+            files.append(('src/.dockerignore', len("\n".join(DOCKERIGNORE_PATTERNS)) + 1))
+        return files
+
     def generate(self) -> None:
         """
         The method triggers the generation of the Dockerfile. The Dockerfile will be used to deploy the API
-        code in a Docker container.
+        code in a Docker container. The slim image is built in two stages and runs as a non-root user, the
+        .dockerignore file keeps the local bytecode and virtual environments out of it.
         """
-        dockerfile_code = self.mongo_model_template.render(application_port=self.application_port)
+        dockerfile_code = self.mongo_model_template.render(application_port=self.application_port,
+                                                           production=self.production,
+                                                           slim_image=self.slim_image)
         self.write_to_src('Dockerfile', dockerfile_code)
+
+        if self.slim_image:
+            self.write_to_src('.dockerignore', "\n".join(DOCKERIGNORE_PATTERNS) + "\n")
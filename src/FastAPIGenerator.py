@@ -1,16 +1,11 @@
 from Generator import ResourceBasedGenerator
-from typing import List
+from typing import Tuple
+from IntermediateRepresentation import ResourceIR
 from view import Options
 
-datatype_converter = {
-    'string': 'str',
-    'integer': 'int',
-    'decimal': 'float'
-}
-
 
 class FastAPIGenerator(ResourceBasedGenerator):
-    def __init__(self, resources: List[dict], generation_uid, options: Options):
+    def __init__(self, resources: Tuple[ResourceIR, ...], generation_uid, options: Options):
         """
         :param resources: the list of resources defined by the user
         :param generation_uid: the identifier of the generation, used to group the source code in a directory
@@ -21,30 +16,68 @@ class FastAPIGenerator(ResourceBasedGenerator):
         self.application_port = options.application_port
         self.project_metadata = options.project_metadata.dict()
         self.main_app_in_container = options.run_main_app_in_container
+        self.lazy_loading = options.lazy_loading
+        self.async_database = options.async_database
+        self.fast_json_responses = options.fast_json_responses
+        self.compression = options.compression.dict() if options.compression and options.compression.enabled else None
+        self.production = options.deployment_profile == "production"
+        # a tuned MariaDB server only accepts the connections of the expected number of workers
+        self.max_workers = options.database_options.expected_app_workers \
+            if self.type == "MariaDB" and options.database_options.server_tuning_enabled else None
+        self.warm_up_pool = self.type == "MariaDB" and options.database_options.warm_up_pool
+        self.create_indexes = self.type == "MongoDB"
         self.utils_template = self.read_template_from_file('utils.jinja2')
         self.router_template_mariadb = self.read_template_from_file('router_with_sql.jinja2')
         self.router_template_mongodb = self.read_template_from_file('router_with_mongo.jinja2')
         self.entrypoint_template = self.read_template_from_file('fastapi_entrypoint.jinja2')
         self.main_app_template = self.read_template_from_file('main_fastapi.jinja2')
+        self.server_config_template = self.read_template_from_file('gunicorn_conf.jinja2')
+        self.caching_template = self.read_template_from_file('caching.jinja2')
+        self.middleware_template = self.read_template_from_file('middleware.jinja2')
 
-        self.at_least_one_cached_resource = False
-
-        for resource in self.resources:
-            if resource.get("options").get("api_caching_enabled") is True:
-                self.at_least_one_cached_resource = True
-                break
+        self.at_least_one_cached_resource = any(resource.options.api_caching_enabled for resource in self.resources)
+        # table name -> seconds, for the resources that are also cached in-process
+        self.local_cache_for = {resource.table_name.lower(): resource.options.local_cache_for
+                                for resource in self.resources if resource.options.local_cache_for}
 
-        for resource in self.resources:
-            pk_type = [x for x in resource.get("fields") if x.get("name") == resource.get("primary_key")][0].get("type")
-            resource["pk_type"] = datatype_converter[pk_type]
+    def manifest(self):
+        router_template = self.router_template_mariadb if self.type == "MariaDB" else self.router_template_mongodb
+        files = [('src/utils.py', self.estimate_size(self.utils_template))]
+        files.extend((f'src/{resource.name.lower()}_router.py', self.estimate_size(router_template, (resource,)))
+                     for resource in self.resources)
+        files.append(('src/api.py', self.estimate_size(self.entrypoint_template)))
+        files.append(('src/main.py', self.estimate_size(self.main_app_template)))
+        if self.production:
+            files.append(('src/gunicorn_conf.py', self.estimate_size(self.server_config_template)))
+        files.append(('src/middleware.py', self.estimate_size(self.middleware_template)))
+        if self.at_least_one_cached_resource:
+            files.append(('src/caching.py', self.estimate_size(self.caching_template)))
+        return files
 
     def create_utils_file(self):
         """
         Creates the utils.py file that contains useful information and methods.
         """
-        utils_code = self.utils_template.render(resources=self.resources)
+        utils_code = self.utils_template.render(resources=self.resources, async_database=self.async_database)
         self.write_to_src('utils.py', utils_code)
 
+    def create_caching_file(self):
+        """
+        Creates the caching.py file (the cache backend and the invalidation used by the routers), if at least one
+        resource is cached.
+        """
+        if self.at_least_one_cached_resource:
+            self.write_to_src('caching.py', self.caching_template.render(local_cache_for=self.local_cache_for,
+                                                                     fast_json_responses=self.fast_json_responses))
+
+    def create_middleware_file(self):
+        """
+        Creates the middleware.py file (the ETag and Cache-Control headers of the GET responses, conditional GETs and
+        the compression of the responses, if enabled).
+        """
+        self.write_to_src('middleware.py', self.middleware_template.render(resources=self.resources,
+                                                                           compression=self.compression))
+
     def create_routers(self):
         """
         Creates FastAPI routers for each existing resource and based on the selected database type.
@@ -55,25 +88,46 @@ class FastAPIGenerator(ResourceBasedGenerator):
             router_template = self.router_template_mongodb
 
         for resource in self.resources:
-            caching_enabled = resource.get("options").get("api_caching_enabled")
-            cache_for = resource.get("options").get("cache_for")
-            router_code = router_template.render(entity=resource, caching_enabled=caching_enabled, cache_for=cache_for)
-            self.write_to_src(f'{resource["name"].lower()}_router.py', router_code)
+            caching_enabled = resource.options.api_caching_enabled
+            cache_for = resource.options.cache_for
+            model_module = f'{resource.name.lower()}_model' if self.lazy_loading else 'model'
+            view_module = f'{resource.name.lower()}_view' if self.lazy_loading else 'view'
+            router_code = router_template.render(entity=resource, caching_enabled=caching_enabled, cache_for=cache_for,
+                                                 model_module=model_module, view_module=view_module,
+                                                 async_database=self.async_database,
+                                                 fast_json_responses=self.fast_json_responses)
+            self.write_to_src(f'{resource.name.lower()}_router.py', router_code)
 
     def create_main_app(self):
         """
         Creates the main FastAPI entrypoint file (api.py) and a script to run it outside Docker containers (main.py).
+        The production profile also gets the configuration of its server (gunicorn_conf.py), which runs a worker per
+        CPU.
         """
         entrypoint_code = self.entrypoint_template.render(resources=self.resources,
                                                           caching_enabled=self.at_least_one_cached_resource,
+                                                          local_caching_enabled=bool(self.local_cache_for),
                                                           project_metadata=self.project_metadata,
-                                                          main_app_in_container=self.main_app_in_container)
+                                                          main_app_in_container=self.main_app_in_container,
+                                                          lazy_loading=self.lazy_loading,
+                                                          warm_up_pool=self.warm_up_pool,
+                                                          create_indexes=self.create_indexes,
+                                                          async_database=self.async_database,
+                                                          fast_json_responses=self.fast_json_responses,
+                                                          compression_enabled=self.compression is not None)
         self.write_to_src('api.py', entrypoint_code)
 
-        main_code = self.main_app_template.render(application_port=self.application_port)
+        main_code = self.main_app_template.render(application_port=self.application_port, production=self.production)
         self.write_to_src('main.py', main_code)
 
+        if self.production:
+            server_config_code = self.server_config_template.render(application_port=self.application_port,
+                                                                    max_workers=self.max_workers)
+            self.write_to_src('gunicorn_conf.py', server_config_code)
+
     def generate(self):
         self.create_utils_file()
+        self.create_caching_file()
+        self.create_middleware_file()
         self.create_routers()
         self.create_main_app()
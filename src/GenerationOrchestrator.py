@@ -1,5 +1,8 @@
+from typing import List, Tuple, get_args
 from utils import correct_pipreqs_output
-from view import Input
+from Generator import Generator
+from IntermediateRepresentation import ResourceIR, build_intermediate_representation
+from view import Input, GenerationTarget
 from PydanticGenerator import PydanticGenerator
 from RelationshipHandler import RelationshipHandler
 from SQLAlchemyGenerator import SQLAlchemyGenerator
@@ -11,6 +14,24 @@ from RequirementsGenerator import RequirementsGenerator
 from StructureGenerator import StructureGenerator
 from DockerfileGenerator import DockerfileGenerator
 
+all_targets = list(get_args(GenerationTarget))
+
+# the targets whose output is needed by a given target in order for the generated code to be usable
+target_dependencies = {
+    "models": [],
+    "sql": [],
+    "views": [],
+    "routers": ["models", "views"],
+    "docker": ["requirements"],
+    "requirements": ["routers"]
+}
+
+# the SQL script only exists for MariaDB, whose container runs it in order to create the tables: for MongoDB, 'sql'
+# is neither a default target nor a dependency, and requesting it is a validation error (see Options)
+mariadb_target_dependencies = {
+    "docker": ["sql"]
+}
+
 
 class GenerationOrchestrator:
     def __init__(self, generation_metadata: Input,
@@ -28,38 +49,124 @@ class GenerationOrchestrator:
         self.project_root = project_root
         self.python_interpreter = python_interpreter
 
-    def generate(self):
+    def resolve_targets(self) -> List[str]:
         """
-        Orchestrator method that parses and validates the relationships as a first step. In case of success, proceeds
-        with the construction of the generator list that is to be used in the current generation process. As a final
-        step, it calls the 'generate' method of every chosen generator, thus triggering the creation of generated
-        source code files on the disk.
+        Computes the targets that have to be generated: the ones requested by the user (all the targets of the
+        chosen database type by default), together with their dependencies.
+        """
+        options = self.generation_metadata.options
+        mariadb = options.database_options.db_type == "MariaDB"
+        requested = options.targets if options.targets is not None else \
+            [target for target in all_targets if mariadb or target != "sql"]
+        resolved = set()
+        pending = list(requested)
+
+        while pending:
+            target = pending.pop()
+            if target in resolved:
+                continue
+            resolved.add(target)
+            pending.extend(target_dependencies[target])
+            if mariadb:
+                pending.extend(mariadb_target_dependencies.get(target, []))
+
+        return [target for target in all_targets if target in resolved]
+
+    def build_generators(self, resources: Tuple[ResourceIR, ...], targets: List[str]) -> List[Generator]:
+        """
+        Creates the list of generators that are needed in order to produce the given targets.
+
+        :param resources: the intermediate representation of the resources
+        :param targets: the resolved list of targets
         """
-        r = RelationshipHandler(self.generation_metadata.resources)
-        r.execute()
-        resources = [resource.dict() for resource in r.resources]
         generators = []
         options = self.generation_metadata.options
         db_options = options.database_options
 
         generators.append(StructureGenerator(self.generation_id))
 
-        if options.run_main_app_in_container:
-            generators.append(DockerfileGenerator(resources, self.generation_id, options))
+        if "docker" in targets:
+            if options.run_main_app_in_container:
+                generators.append(DockerfileGenerator(resources, self.generation_id, options))
 
-        generators.append(DockerComposeGenerator(resources, self.generation_id, options))
+            generators.append(DockerComposeGenerator(resources, self.generation_id, options))
 
-        if db_options.db_type == "MariaDB":
-            generators.append(SQLAlchemyGenerator(resources, self.generation_id, options))
+        if "models" in targets:
+            if db_options.db_type == "MariaDB":
+                generators.append(SQLAlchemyGenerator(resources, self.generation_id, options))
+            else:
+                generators.append(MongoGenerator(resources, self.generation_id, options))
+
+        if "sql" in targets:
             generators.append(SQLGenerator(resources, self.generation_id))
-        else:
-            generators.append(MongoGenerator(resources, self.generation_id, options))
 
-        generators.append(PydanticGenerator(resources, self.generation_id))
-        generators.append(FastAPIGenerator(resources, self.generation_id, options))
-        generators.append(RequirementsGenerator(self.generation_id, self.python_interpreter))
+        if "views" in targets:
+            generators.append(PydanticGenerator(resources, self.generation_id, options))
+
+        if "routers" in targets:
+            generators.append(FastAPIGenerator(resources, self.generation_id, options))
 
-        for generator in generators:
+        if "requirements" in targets:
+            generators.append(RequirementsGenerator(self.generation_id, self.python_interpreter))
+
+        return generators
+
+    def generate(self):
+        """
+        Orchestrator method that parses and validates the relationships as a first step. In case of success, proceeds
+        with the construction of the generator list that is to be used in the current generation process (only the
+        generators needed for the selected targets are built). As a final step, it calls the 'generate' method of
+        every chosen generator, thus triggering the creation of generated source code files on the disk.
+        """
+        r = RelationshipHandler(self.generation_metadata.resources)
+        r.execute()
+        resources = build_intermediate_representation(r.resources)
+        targets = self.resolve_targets()
+
+        for generator in self.build_generators(resources, targets):
             generator.generate()
 
-        correct_pipreqs_output(self.project_root, self.generation_id, db_options.db_type)
\ No newline at end of file
+        if "requirements" in targets:
+            options = self.generation_metadata.options
+            compression = options.compression
+            correct_pipreqs_output(self.project_root, self.generation_id,
+                                   options.database_options.db_type, options.async_database,
+                                   options.fast_json_responses,
+                                   tuple(compression.algorithms) if compression and compression.enabled else (),
+                                   options.deployment_profile == "production")
+
+    def plan(self) -> dict:
+        """
+        Validates the relationships and describes what a generation would produce, without rendering any template
+        or writing to the disk: the resolved relationships, the generated join tables and foreign keys and a manifest
+        of the files that would be created (with sizes estimated from the template sources).
+        """
+        declared_tables = {resource.table_name for resource in self.generation_metadata.resources}
+        r = RelationshipHandler(self.generation_metadata.resources)
+        r.execute()
+        resources = build_intermediate_representation(r.resources)
+        targets = self.resolve_targets()
+
+        relationships = [{"parent": parent,
+                          "child": child,
+                          "type": data["rel_type"],
+                          "foreign_key": data["foreign_key_name"]}
+                         for parent, child, data in r.relationships.edges(data=True)]
+        foreign_keys = [{"table": resource.table_name,
+                         "field": foreign_key.field,
+                         "references": foreign_key.references,
+                         "reference_field": foreign_key.reference_field}
+                        for resource in resources for foreign_key in resource.foreign_keys]
+        files = [{"path": path, "estimated_size": size}
+                 for generator in self.build_generators(resources, targets)
+                 for path, size in generator.manifest()]
+
+        return {
+            "targets": targets,
+            "relationships": relationships,
+            "join_tables": [resource.table_name for resource in resources
+                            if resource.table_name not in declared_tables],
+            "foreign_keys": foreign_keys,
+            "files": files,
+            "estimated_total_size": sum(file["estimated_size"] for file in files)
+        }
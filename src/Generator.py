@@ -1,8 +1,56 @@
 import abc
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 from jinja2 import Template
+from IntermediateRepresentation import ResourceIR
+
+
+# used to estimate the sizes of the generated files: about two thirds of a template source end up in the rendered
+# file (the rest are jinja2 tags and the code of the options that are not enabled), and every field of a resource
+# adds about 100 bytes
+RENDERED_TEMPLATE_SHARE = 0.65
+ESTIMATED_FIELD_SIZE = 100
+
+
+@lru_cache(maxsize=None)
+def read_template_source(template_path: str) -> str:
+    """
+    Reads the source of a jinja2 template. The result is cached, so every template is read once per process.
+
+    :param template_path: the path of the template file
+    """
+    with open(template_path, 'r') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def load_template(template_path: str) -> Template:
+    """
+    Compiles a jinja2 template. The result is cached, so every template is compiled once per process.
+
+    :param template_path: the path of the template file
+    """
+    return Template(read_template_source(template_path), trim_blocks=True, lstrip_blocks=True)
+
+
+class LazyTemplate:
+    def __init__(self, template_path: str):
+        """
+        Placeholder for a template that is only read from the disk when it is rendered (or its size is estimated)
+        for the first time, so generators can be instantiated without any disk I/O.
+
+        :param template_path: the path of the template file
+        """
+        self.template_path = template_path
+
+    def render(self, *args, **kwargs) -> str:
+        return load_template(self.template_path).render(*args, **kwargs)
+
+    @property
+    def source_size(self) -> int:
+        return len(read_template_source(self.template_path))
 
 
 class Generator(abc.ABC):
@@ -23,14 +71,34 @@ class Generator(abc.ABC):
         """
         pass
 
-    def read_template_from_file(self, template_name: str) -> Template:
+    def manifest(self) -> List[Tuple[str, int]]:
+        """
+        Returns the files that the generator would create (paths relative to the generation directory) together
+        with an estimation of their sizes in bytes. Never renders templates (see 'estimate_size').
+        """
+        return []
+
+    @staticmethod
+    def estimate_size(template: LazyTemplate, resources: Tuple[ResourceIR, ...] = (), files: int = 1) -> int:
         """
-        Concrete method that reads the jinja2 template and returns an object represting the template.
+        Estimates the size of a file rendered from a template, without rendering it: from the size of the template
+        source (read once per process) and the number of fields of the resources that the file declares.
+
+        :param template: the template of the file
+        :param resources: the resources declared in the file
+        :param files: the number of files that the template is split between (e.g. the per-resource modules)
+        """
+        fields = sum(len(resource.fields) for resource in resources)
+        return int(template.source_size * RENDERED_TEMPLATE_SHARE / files) + ESTIMATED_FIELD_SIZE * fields
+
+    def read_template_from_file(self, template_name: str) -> LazyTemplate:
+        """
+        Concrete method that returns an object representing the jinja2 template. The template is read (and compiled)
+        when it is rendered for the first time.
 
         :param template_name: the name of the template file (including the extention)
         """
-        with open(os.path.join(self.project_root_dir, 'templates', template_name), 'r') as f:
-            return Template(f.read(), trim_blocks=True, lstrip_blocks=True)
+        return LazyTemplate(os.path.join(self.project_root_dir, 'templates', template_name))
 
     def write_to_src(self, file_name: str, content: str) -> None:
         """
@@ -54,7 +122,11 @@ class Generator(abc.ABC):
 
 
 class ResourceBasedGenerator(Generator):
-    def __init__(self, resources: List[dict], generation_uid: str):
+    def __init__(self, resources: Tuple[ResourceIR, ...], generation_uid: str):
+        """
+        :param resources: the intermediate representation of the resources - shared between generators, read-only
+        :param generation_uid: the identifier of the current generation process
+        """
         super().__init__(generation_uid)
         self.resources = resources
 
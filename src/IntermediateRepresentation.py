@@ -0,0 +1,324 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from view import Resource, ResourceOptions
+
+sql_datatypes = {
+    'string': 'varchar({length})',
+    'integer': 'int(11)',
+    'decimal': 'double(5, 2)',
+    'boolean': 'boolean',
+    'date': 'date'
+}
+
+sqlalchemy_datatypes = {
+    'string': 'sqlalchemy.String({length})',
+    'integer': 'sqlalchemy.Integer',
+    'decimal': 'sqlalchemy.Float',
+    'boolean': 'sqlalchemy.Boolean',
+    'date': 'sqlalchemy.Date'
+}
+
+pydantic_datatypes = {
+    'string': 'constr(min_length=1, max_length={length})',
+    'integer': 'int',
+    'decimal': 'float',
+    'boolean': 'bool',
+    'date': 'datetime.date'
+}
+
+# BSON type aliases of the stored values, used by the partial filters of the MongoDB indexes
+bson_datatypes = {
+    'string': 'string',
+    'integer': 'number',
+    'decimal': 'number',
+    'boolean': 'bool',
+    'date': 'date'
+}
+
+# types used for the path parameters of the generated routes
+python_datatypes = {
+    'string': 'str',
+    'integer': 'int',
+    'decimal': 'float',
+    'boolean': 'bool',
+    'date': 'str'
+}
+
+
+# The classes below form the intermediate representation (IR) of the resources. It is computed once, after the
+# relationships were handled, and then shared by every generator. The instances are immutable (frozen, slotted
+# dataclasses holding tuples), so the generators can read them without copying.
+@dataclass(frozen=True)
+class ForeignKeyIR:
+    __slots__ = ("field", "references", "reference_field")
+    field: str
+    references: str
+    reference_field: str
+
+
+@dataclass(frozen=True)
+class FieldIR:
+    __slots__ = ("name", "type", "length", "nullable", "is_primary_key", "foreign_key", "sql_type",
+                 "sqlalchemy_type", "pydantic_type", "python_type", "bson_type")
+    name: str
+    type: str
+    length: Optional[int]
+    nullable: bool
+    is_primary_key: bool
+    foreign_key: Optional[ForeignKeyIR]
+    sql_type: str
+    sqlalchemy_type: str
+    pydantic_type: str
+    python_type: str
+    bson_type: str
+
+
+@dataclass(frozen=True)
+class UniqueIR:
+    __slots__ = ("name", "unique_fields")
+    name: str
+    unique_fields: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class IndexFieldIR:
+    __slots__ = ("name", "descending")
+    name: str
+    descending: bool
+
+
+@dataclass(frozen=True)
+class IndexIR:
+    __slots__ = ("name", "index_fields")
+    name: str
+    index_fields: Tuple[IndexFieldIR, ...]
+
+
+@dataclass(frozen=True)
+class RelationshipIR:
+    __slots__ = ("type", "table", "reference_field", "role", "resource")
+    type: str
+    table: str
+    reference_field: Optional[str]
+    role: Optional[str]
+    resource: str
+
+
+@dataclass(frozen=True)
+class ExpansionIR:
+    """
+    A relationship that can be expanded in the responses of a resource (loaded together with it). The related
+    entities are matched by local_field == remote_field or, for many-to-many relationships, through the join table:
+    local_field == through_local_field and through_remote_field == remote_field.
+    """
+    __slots__ = ("name", "resource", "table", "many", "local_field", "remote_field", "through", "through_resource",
+                 "through_local_field", "through_remote_field", "fields")
+    name: str
+    resource: str
+    table: str
+    many: bool
+    local_field: str
+    remote_field: str
+    through: Optional[str]
+    through_resource: Optional[str]
+    through_local_field: Optional[str]
+    through_remote_field: Optional[str]
+    fields: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ResourceOptionsIR:
+    __slots__ = ("api_caching_enabled", "cache_for", "local_cache_for", "pagination", "hypermedia")
+    api_caching_enabled: bool
+    cache_for: int
+    local_cache_for: Optional[int]
+    pagination: str
+    hypermedia: str
+
+
+@dataclass(frozen=True)
+class ResourceIR:
+    __slots__ = ("name", "table_name", "primary_key", "pk_type", "fields", "uniques", "indexes", "relationships",
+                 "expansions", "foreign_keys", "options")
+    name: str
+    table_name: str
+    primary_key: str
+    pk_type: str
+    fields: Tuple[FieldIR, ...]
+    uniques: Tuple[UniqueIR, ...]
+    indexes: Tuple[IndexIR, ...]
+    relationships: Tuple[RelationshipIR, ...]
+    expansions: Tuple[ExpansionIR, ...]
+    foreign_keys: Tuple[ForeignKeyIR, ...]
+    options: ResourceOptionsIR
+
+
+def build_field(field, resource: Resource, foreign_keys: Tuple[ForeignKeyIR, ...]) -> FieldIR:
+    """
+    Creates the IR of a field, resolving all of the type mappings used by the generators.
+
+    :param field: the field (as a Pydantic model)
+    :param resource: the resource that contains the field
+    :param foreign_keys: the foreign keys of the resource (already converted)
+    """
+    foreign_key = next((fk for fk in foreign_keys if fk.field == field.name), None)
+
+    return FieldIR(name=field.name,
+                   type=field.type,
+                   length=field.length,
+                   nullable=field.nullable,
+                   is_primary_key=field.name == resource.primary_key,
+                   foreign_key=foreign_key,
+                   sql_type=sql_datatypes[field.type].format(length=field.length),
+                   sqlalchemy_type=sqlalchemy_datatypes[field.type].format(length=field.length),
+                   pydantic_type=pydantic_datatypes[field.type].format(length=field.length),
+                   python_type=python_datatypes[field.type],
+                   bson_type=bson_datatypes[field.type])
+
+
+def build_indexes(resource: Resource, uniques: Tuple[UniqueIR, ...],
+                  foreign_keys: Tuple[ForeignKeyIR, ...]) -> Tuple[IndexIR, ...]:
+    """
+    Creates the IR of the secondary indexes of a resource: the declared ones and an index for every foreign key
+    column that is not already the first column of the primary key, of a unique or of a declared index.
+
+    :param resource: the resource (as a Pydantic model)
+    :param uniques: the uniques of the resource (already converted)
+    :param foreign_keys: the foreign keys of the resource (already converted)
+    """
+    indexes = [IndexIR(index.name, tuple(IndexFieldIR(field.name, field.descending) for field in index.index_fields))
+               for index in resource.indexes or []]
+    leading_columns = {resource.primary_key}
+    leading_columns.update(unique.unique_fields[0] for unique in uniques)
+    leading_columns.update(index.index_fields[0].name for index in indexes)
+
+    for foreign_key in foreign_keys:
+        if foreign_key.field not in leading_columns:
+            indexes.append(IndexIR(f"{resource.table_name}_{foreign_key.field}_fk_index",
+                                   (IndexFieldIR(foreign_key.field, False),)))
+            leading_columns.add(foreign_key.field)
+
+    return tuple(indexes)
+
+
+def build_expansions(resource: Resource, resources_by_table: dict) -> Tuple[ExpansionIR, ...]:
+    """
+    Creates the IR of the relationships of a resource that can be expanded. A resource that holds a foreign key to the
+    related one is expanded to (at most) one entity. A resource referenced by the foreign keys of the related one is
+    expanded to the referencing entities (to one of them for one-to-one relationships). Many-to-many relationships go
+    through the join table. The expansions to many entities are named after the related table, the expansions to a
+    single one after the related resource (e.g. 'customers' and 'customer').
+
+    :param resource: the resource (as a Pydantic model, after the relationships were handled)
+    :param resources_by_table: all of the resources (including the join tables), by table name
+    """
+    expansions = []
+    field_names = {field.name.lower() for field in resource.fields}
+
+    for relationship in resource.relationships or []:
+        related = resources_by_table[relationship.table]
+        fields = tuple(field.name for field in related.fields)
+
+        own_fk = next((fk for fk in resource.foreign_keys or [] if fk.references == related.table_name), None)
+        related_fk = next((fk for fk in related.foreign_keys or [] if fk.references == resource.table_name), None)
+        join_table = resources_by_table.get(f"{resource.table_name}_{related.table_name}") or \
+            resources_by_table.get(f"{related.table_name}_{resource.table_name}")
+        to_one = own_fk is not None or (related_fk is not None and relationship.type == "ONE-TO-ONE")
+        name = related.name.lower() if to_one else related.table_name.lower()
+
+        if name in field_names or name in [expansion.name for expansion in expansions]:
+            continue
+
+        if own_fk:
+            expansions.append(ExpansionIR(name, related.name, related.table_name, False, own_fk.field,
+                                          own_fk.reference_field, None, None, None, None, fields))
+        elif related_fk:
+            expansions.append(ExpansionIR(name, related.name, related.table_name, not to_one,
+                                          related_fk.reference_field, related_fk.field, None, None, None, None, fields))
+        elif relationship.type == "MANY-TO-MANY" and join_table:
+            local_fk = next(fk for fk in join_table.foreign_keys if fk.references == resource.table_name)
+            remote_fk = next(fk for fk in join_table.foreign_keys if fk.references == related.table_name)
+            expansions.append(ExpansionIR(name, related.name, related.table_name, True, local_fk.reference_field,
+                                          remote_fk.reference_field, join_table.table_name, join_table.name,
+                                          local_fk.field, remote_fk.field, fields))
+
+    return tuple(expansions)
+
+
+def build_resource(resource: Resource, resource_names: dict, resources_by_table: dict) -> ResourceIR:
+    """
+    Creates the IR of a resource.
+
+    :param resource: the resource (as a Pydantic model, after the relationships were handled)
+    :param resource_names: a mapping between table names and resource names, used to resolve relationship targets
+    :param resources_by_table: all of the resources by table name, used to resolve the expandable relationships
+    """
+    foreign_keys = tuple(ForeignKeyIR(fk.field, fk.references, fk.reference_field)
+                         for fk in resource.foreign_keys or [])
+    fields = tuple(build_field(field, resource, foreign_keys) for field in resource.fields)
+    uniques = tuple(UniqueIR(unique.name, tuple(unique.unique_fields)) for unique in resource.uniques or [])
+    indexes = build_indexes(resource, uniques, foreign_keys)
+    relationships = tuple(RelationshipIR(type=rel.type,
+                                         table=rel.table,
+                                         reference_field=rel.reference_field,
+                                         role=rel.role,
+                                         resource=resource_names[rel.table])
+                          for rel in resource.relationships or [])
+    expansions = build_expansions(resource, resources_by_table)
+    pk_type = [field.python_type for field in fields if field.is_primary_key][0]
+    resource_options = resource.options or ResourceOptions()
+    options = ResourceOptionsIR(api_caching_enabled=bool(resource_options.api_caching_enabled),
+                                cache_for=resource_options.cache_for,
+                                local_cache_for=resource_options.local_cache_for,
+                                pagination=resource_options.pagination,
+                                hypermedia=resource_options.hypermedia)
+
+    return ResourceIR(name=resource.name,
+                      table_name=resource.table_name,
+                      primary_key=resource.primary_key,
+                      pk_type=pk_type,
+                      fields=fields,
+                      uniques=uniques,
+                      indexes=indexes,
+                      relationships=relationships,
+                      expansions=expansions,
+                      foreign_keys=foreign_keys,
+                      options=options)
+
+
+def build_intermediate_representation(resources: List[Resource]) -> Tuple[ResourceIR, ...]:
+    """
+    Converts the resources (after 'RelationshipHandler.execute' was called) into the immutable IR that is shared by
+    all of the generators.
+
+    :param resources: the list of resources, including the generated join tables
+    """
+    resource_names = {resource.table_name: resource.name for resource in resources}
+    resources_by_table = {resource.table_name: resource for resource in resources}
+    return tuple(build_resource(resource, resource_names, resources_by_table) for resource in resources)
+
+
+def related_resource_names(resource: ResourceIR, resources: Tuple[ResourceIR, ...]) -> Tuple[str, ...]:
+    """
+    Returns the names of the resources that are reachable from the given one through relationships (the resource
+    included), in the order in which they were declared. These are the classes that have to be loaded together
+    so that the ORM can resolve the relationships (the join tables of the many-to-many ones included).
+
+    :param resource: the resource from which the search starts
+    :param resources: all of the resources of the generation
+    """
+    by_name = {x.name: x for x in resources}
+    reachable = {resource.name}
+    pending = [resource]
+
+    while pending:
+        current = pending.pop()
+        linked = [relationship.resource for relationship in current.relationships]
+        linked.extend(expansion.through_resource for expansion in current.expansions if expansion.through_resource)
+
+        for name in linked:
+            if name not in reachable:
+                reachable.add(name)
+                pending.append(by_name[name])
+
+    return tuple(x.name for x in resources if x.name in reachable)
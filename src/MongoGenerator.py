@@ -12,16 +12,68 @@ class MongoGenerator(ResourceBasedGenerator):
         super().__init__(resources, generation_uid)
         self.username = options.database_options.db_username
         self.password = options.database_options.db_password
+        self.client_options = self.get_client_options(options.database_options)
         self.main_app_in_container = options.run_main_app_in_container
+        self.lazy_loading = options.lazy_loading
+        self.async_database = options.async_database
         self.mongo_model_template = self.read_template_from_file('model_mongo.jinja2')
 
+    @staticmethod
+    def get_client_options(db_options):
+        """
+        Returns the settings of the MongoDB client, as keyword arguments of MongoClient. As for the SQL databases,
+        pool_size connections are kept open and up to pool_size + max_overflow connections are opened under load.
+
+        :param db_options: the settings of the database (as a Pydantic model)
+        """
+        client_options = {
+            "minPoolSize": db_options.pool_size,
+            "maxPoolSize": db_options.pool_size + db_options.max_overflow,
+            "connectTimeoutMS": db_options.connect_timeout_ms,
+            "serverSelectionTimeoutMS": db_options.server_selection_timeout_ms,
+            "w": db_options.write_concern if db_options.write_concern == "majority" else int(db_options.write_concern),
+            "readPreference": db_options.read_preference
+        }
+
+        if db_options.socket_timeout_ms is not None:
+            client_options["socketTimeoutMS"] = db_options.socket_timeout_ms
+
+        return client_options
+
+    def manifest(self):
+        if not self.lazy_loading:
+            return [('src/model.py', self.estimate_size(self.mongo_model_template, self.resources))]
+
+        # the template is split between the module of the database handler and the modules of the resources
+        model_files = len(self.resources) + 1
+        files = [('src/model.py', self.estimate_size(self.mongo_model_template, files=model_files))]
+        files.extend((f'src/{resource.name.lower()}_model.py',
+                      self.estimate_size(self.mongo_model_template, (resource,), model_files))
+                     for resource in self.resources)
+        return files
+
     def generate(self) -> None:
         """
-        Creates the model.py file that contains methods that will be used to communicate with the MongoDB server.
+        Creates the model.py file that contains methods that will be used to communicate with the MongoDB server
+        (including the unique indexes of the collections, created when the application starts).
+        When lazy loading is enabled, 'model.py' only contains the connection handler and the methods of every
+        resource are placed in a separate '<resource>_model.py'.
         """
-        model_code = self.mongo_model_template.render(entities=self.resources,
+        model_code = self.mongo_model_template.render(entities=() if self.lazy_loading else self.resources,
+                                                      indexed_resources=self.resources,
                                                       username=self.username,
                                                       password=self.password,
                                                       port=27017,
-                                                      main_app_in_container=self.main_app_in_container)
+                                                      client_options=self.client_options,
+                                                      main_app_in_container=self.main_app_in_container,
+                                                      generic_functions=True,
+                                                      async_database=self.async_database)
         self.write_to_src('model.py', model_code)
+
+        if not self.lazy_loading:
+            return
+
+        for resource in self.resources:
+            model_code = self.mongo_model_template.render(entities=(resource,), generic_functions=False,
+                                                          async_database=self.async_database)
+            self.write_to_src(f'{resource.name.lower()}_model.py', model_code)
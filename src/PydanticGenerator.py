@@ -1,59 +1,44 @@
-from dataclasses import dataclass
-from typing import List
+from typing import Tuple
 from Generator import ResourceBasedGenerator
-
-pseudocode_to_pydantic = {
-    'string': 'constr(min_length=1, max_length={length})',
-    'integer': 'int',
-    'decimal': 'float',
-    'boolean': 'bool',
-    'date': 'datetime.date'
-}
-
-
-@dataclass
-class PydanticField:
-    name: str
-    type: str
-
-
-@dataclass
-class PydanticResource:
-    name: str
-    table_name: str
-    primary_key: str
-    fields: List[PydanticField]
+from IntermediateRepresentation import ResourceIR
+from view import Options
 
 
 class PydanticGenerator(ResourceBasedGenerator):
-    def __init__(self, resources: List[dict], generation_uid: str):
+    def __init__(self, resources: Tuple[ResourceIR, ...], generation_uid: str, options: Options):
         """
         :param resources: the list of resources defined by the user
         :param generation_uid: the identifier of the generation, used to group the source code in a directory
+        :param options: the document containing the settings of the generated application (as a Pydantic model)
         """
         super().__init__(resources, generation_uid)
+        self.lazy_loading = options.lazy_loading
         self.pydantic_template = self.read_template_from_file('pydantic.jinja2')
 
+    def manifest(self):
+        if not self.lazy_loading:
+            return [('src/view.py', self.estimate_size(self.pydantic_template, self.resources))]
+
+        # the template is split between the module of the shared models and the modules of the resources
+        view_files = len(self.resources) + 1
+        files = [('src/view.py', self.estimate_size(self.pydantic_template, files=view_files))]
+        files.extend((f'src/{resource.name.lower()}_view.py',
+                      self.estimate_size(self.pydantic_template, (resource,), view_files))
+                     for resource in self.resources)
+        return files
+
     def generate(self) -> None:
         """
-        Creates the view.py file that contains all of the Pydantic models of the generated application.
+        Creates the view.py file that contains all of the Pydantic models of the generated application. When lazy
+        loading is enabled, the model of every resource is placed in a separate '<resource>_view.py' instead.
         """
-        resources = []
-        for resource in self.resources:
-            fields = []
-            for field in resource["fields"]:
-                if field["type"] == "string":
-                    field_type = pseudocode_to_pydantic["string"].format(length=field["length"])
-                else:
-                    field_type = pseudocode_to_pydantic[field["type"]]
-
-                fields.append(PydanticField(field["name"], field_type))
-            resources.append(PydanticResource(resource["name"],
-                                              resource["table_name"],
-                                              resource["primary_key"],
-                                              fields))
-
-        pydantic_code = self.pydantic_template.render(resources=resources)
+        pydantic_code = self.pydantic_template.render(resources=() if self.lazy_loading else self.resources,
+                                                      error_model=True)
         self.write_to_src('view.py', pydantic_code)
 
+        if not self.lazy_loading:
+            return
 
+        for resource in self.resources:
+            pydantic_code = self.pydantic_template.render(resources=(resource,), error_model=False)
+            self.write_to_src(f'{resource.name.lower()}_view.py', pydantic_code)
@@ -1,4 +1,4 @@
-from view import Resource, ForeignKey, ResourceField, Unique, Relationship
+from view import Resource, ForeignKey, ResourceField, Unique, Relationship, ResourceOptions
 from typing import List
 from networkx import DiGraph, find_cycle, exception
 
@@ -103,13 +103,17 @@ class RelationshipHandler:
                                       role="Child")]
         uniques = [Unique(name=f"{table_name}_un",
                           unique_fields=["id", parent_table.primary_key, child_table.primary_key])]
+        # the link table only drops its hypermedia if both of the linked tables did
+        hypermedia = "none" if all((table.options or ResourceOptions()).hypermedia == "none"
+                                   for table in (parent_table, child_table)) else "all"
 
         link_table = Resource(name=table_name,
                               table_name=table_name,
                               fields=fields,
                               primary_key="id",
                               relationships=relationships,
-                              uniques=uniques)
+                              uniques=uniques,
+                              options=ResourceOptions(hypermedia=hypermedia))
         self.resources.append(link_table)
         create_fk_many_to_many(link_table, parent_table, fields[1].name)
         create_fk_many_to_many(link_table, child_table, fields[2].name)
@@ -22,6 +22,10 @@ class RequirementsGenerator(Generator):
         self.python_interpreter = python_interpreter
         super().__init__(generation_uid)
 
+    def manifest(self):
+        # written by pipreqs, a line for every package imported by the generated code
+        return [('src/requirements.txt', 250)]
+
     def generate(self) -> None:
         """
         Executes a system command that installs pipreqs and then uses it in order to generate the requirements.
@@ -1,99 +1,73 @@
-from dataclasses import dataclass
-from typing import List
+from typing import Tuple
 from Generator import ResourceBasedGenerator
+from IntermediateRepresentation import ResourceIR, related_resource_names
 from view import Options
 
 
-# Adapter classes so that the dynamic parts of the templates can be replaced easier (with little processing)
-@dataclass
-class Field:
-    name: str
-    attributes: List[str]
-
-
-@dataclass
-class Unique:
-    name: str
-    unique_fields: List[str]
-
-
-@dataclass
-class Relationship:
-    type: str
-    table: str
-    reference_field: str
-    role: str
-    resource: str
-
-
-@dataclass
-class Resource:
-    name: str
-    table_name: str
-    fields: List[Field]
-    uniques: List[Unique]
-    relationships: List[Relationship]
-
-
-datatype_converter = {
-    'string': 'sqlalchemy.String',
-    'integer': 'sqlalchemy.Integer',
-    'decimal': 'sqlalchemy.Float',
-    'boolean': 'sqlalchemy.Boolean',
-    'date': 'sqlalchemy.Date'
-}
-
-
 class ConnectionConfig:
     def __init__(self, db_type='mysql+mysqlconnector', db_user='root', db_user_pass='password', db_host='localhost',
-                 db_port=3306, db_instance='generated_db'):
+                 db_port=3306, db_instance='generated_db', pool_size=5, max_overflow=10, pool_recycle=3600,
+                 pool_pre_ping=True, statement_timeout_ms=None, echo=False, async_database=False):
         self.db_type = db_type
         self.db_user = db_user
         self.db_user_pass = db_user_pass
         self.db_host = db_host
         self.db_port = db_port
         self.db_instance = db_instance
-
-
-def get_attributes_from_field(field: dict, is_primary_key: bool):
-    """
-    Function used to get the list of attributes from a field so they can be persisted in the sqlalchemy.Column
-
-    :param field: dictionary that holds field related properties
-    :param is_primary_key: boolean that indicates whether the field is a primary key or not
-    :return: a list of strings containing the raw attributes
-    """
-    attributes = []
-
-    if field["type"] == "string":
-        attributes.append(f'{datatype_converter["string"]}({field["length"]})')
-    else:
-        attributes.append(datatype_converter[field["type"]])
-
-    attributes.append("nullable=True" if field["nullable"] is True else "nullable=False")
-
-    if is_primary_key:
-        attributes.append("primary_key=True")
-
-    return attributes
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+        self.statement_timeout_ms = statement_timeout_ms
+        self.echo = echo
+        self.async_database = async_database
 
 
 class SQLAlchemyGenerator(ResourceBasedGenerator):
-    def __init__(self, resources: List[dict], generation_uid, options: Options):
+    def __init__(self, resources: Tuple[ResourceIR, ...], generation_uid, options: Options):
         """
         :param resources: the list of resources defined by the user
         :param generation_uid: the identifier of the generation, used to group the source code in a directory
         :param options: the document containing the settings of the generated application (as a Pydantic model)
         """
         super().__init__(resources, generation_uid)
+        self.lazy_loading = options.lazy_loading
+        self.async_database = options.async_database
         host = 'database' if options.run_main_app_in_container is True else 'localhost'
-        self.db_connection_config = ConnectionConfig(db_user=options.database_options.db_username,
-                                                     db_user_pass=options.database_options.db_password,
-                                                     db_host=host)
+        db_options = options.database_options
+        self.db_connection_config = ConnectionConfig(db_type='mysql+aiomysql' if self.async_database
+                                                     else 'mysql+mysqlconnector',
+                                                     db_user=db_options.db_username,
+                                                     db_user_pass=db_options.db_password,
+                                                     db_host=host,
+                                                     pool_size=db_options.pool_size,
+                                                     max_overflow=db_options.max_overflow,
+                                                     pool_recycle=db_options.pool_recycle,
+                                                     pool_pre_ping=db_options.pool_pre_ping,
+                                                     statement_timeout_ms=db_options.statement_timeout_ms,
+                                                     echo=db_options.echo_sql,
+                                                     async_database=self.async_database)
         self.db_conn_template = self.read_template_from_file('db_conn.jinja2')
         self.sqlalchemy_template = self.read_template_from_file('sqlalchemy_model.jinja2')
         self.model_template = self.read_template_from_file('model_sql.jinja2')
 
+    def manifest(self):
+        files = [('src/db.py', self.estimate_size(self.db_conn_template))]
+        files.extend((f'src/{resource.name}.py', self.estimate_size(self.sqlalchemy_template, (resource,)))
+                     for resource in self.resources)
+
+        if not self.lazy_loading:
+            files.append(('src/model.py', self.estimate_size(self.model_template, self.resources)))
+            return files
+
+        # the template is split between the module of the generic functions and the modules of the resources
+        model_files = len(self.resources) + 1
+        files.append(('src/model.py', self.estimate_size(self.model_template, files=model_files)))
+        files.extend((f'src/{resource.name.lower()}_model.py',
+                      self.estimate_size(self.model_template, (resource,), model_files))
+                     for resource in self.resources)
+        return files
+
     def generate_connection_from_template(self) -> None:
         """
         Method that generates a database connection from a given configuration.
@@ -106,45 +80,34 @@ class SQLAlchemyGenerator(ResourceBasedGenerator):
         Generates a file for each SQLAlchemy model.
         """
         for resource in self.resources:
-            fields = []
-
-            for field in resource["fields"]:
-                field_attributes = get_attributes_from_field(field, (field["name"] == resource["primary_key"]))
-
-                if resource["foreign_keys"] is not None:
-                    for foreign_key in resource["foreign_keys"]:
-                        if field["name"] == foreign_key["field"]:
-                            # insert ForeignKey attribute at position 1
-                            field_attributes.insert(1, f'sqlalchemy.ForeignKey("{foreign_key["references"]}.'
-                                                       f'{foreign_key["reference_field"]}")')
-                            break
-
-                fields.append(Field(field["name"], field_attributes))
-
-            uniques = resource["uniques"] if "uniques" in resource else None
-
-            relationships = resource.get("relationships")
-
-            if relationships:
-                for rel in relationships:
-                    rel["resource"] = [x for x in self.resources
-                                       if x.get("table_name") == rel.get("table")][0].get("name")
-
-            sqlalchemy_code = self.sqlalchemy_template.render(resource=Resource(resource["name"],
-                                                                                resource["table_name"],
-                                                                                fields,
-                                                                                uniques,
-                                                                                relationships))
-            self.write_to_src(f'{resource["name"]}.py', sqlalchemy_code)
+            sqlalchemy_code = self.sqlalchemy_template.render(resource=resource)
+            self.write_to_src(f'{resource.name}.py', sqlalchemy_code)
 
     def generate_model_code(self) -> None:
         """
         Method that triggers the 'model.py' code generation - file contains code that's used to
-        perform database operations
+        perform database operations. When lazy loading is enabled, 'model.py' only contains the generic functions and
+        every resource gets its own '<resource>_model.py', which imports only the ORM classes it needs.
         """
-        model_code = self.model_template.render(entities=self.resources)
+        if not self.lazy_loading:
+            model_code = self.model_template.render(entities=self.resources,
+                                                    orm_classes=[resource.name for resource in self.resources],
+                                                    generic_functions=True,
+                                                    async_database=self.async_database)
+            self.write_to_src('model.py', model_code)
+            return
+
+        model_code = self.model_template.render(entities=(), orm_classes=(), generic_functions=True,
+                                                async_database=self.async_database)
         self.write_to_src('model.py', model_code)
 
+        for resource in self.resources:
+            model_code = self.model_template.render(entities=(resource,),
+                                                    orm_classes=related_resource_names(resource, self.resources),
+                                                    generic_functions=False,
+                                                    async_database=self.async_database)
+            self.write_to_src(f'{resource.name.lower()}_model.py', model_code)
+
     def generate(self):
         """
         Executes all of the steps necessary to generate the model code that can be used to communicate with MariaDB.
@@ -4,11 +4,13 @@ import uuid
 import zipfile
 from fastapi import FastAPI, Response, status
 from pydantic import BaseModel
+from ArtifactStore import create_artifact_store
 from GenerationOrchestrator import GenerationOrchestrator
 from view import Input
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
+artifact_store = create_artifact_store(project_root)
 
 app = FastAPI(
     title="A Py Generator - Code Generation As A Service",
@@ -30,9 +32,9 @@ class Error(BaseModel):
     error_reason: str
 
 
-def zip_generated_code(path: str) -> Response:
+def zip_generated_code(path: str) -> bytes:
     """
-    Zips everything at the given path (recursively) and returns an HTTP response containing the zip file.
+    Zips everything at the given path (recursively) and returns the content of the zip file.
 
     :param path: the path of the directory that is to be zipped
     """
@@ -43,14 +45,21 @@ def zip_generated_code(path: str) -> Response:
                 zip_file.write(os.path.join(root, file),
                                os.path.relpath(os.path.join(root, file), os.path.join(path, '..')))
 
-        resp = Response(s.getvalue(),
-                        media_type="application/x-zip-compressed",
-                        headers={
-                            'Content-Disposition': f'attachment;filename=result.zip',
-                        },
-                        status_code=200)
+    return s.getvalue()
 
-        return resp
+
+def zip_response(content: bytes) -> Response:
+    """
+    Returns an HTTP response containing the given zip file.
+
+    :param content: the content of the zip file
+    """
+    return Response(content,
+                    media_type="application/x-zip-compressed",
+                    headers={
+                        'Content-Disposition': f'attachment;filename=result.zip',
+                    },
+                    status_code=200)
 
 
 @app.post("/api/generate/")
@@ -66,7 +75,9 @@ def generate_app(generation_metadata: Input, response: Response):
 
     try:
         orchestrator.generate()
-        return zip_generated_code(os.path.join(project_root, generation_id))
+        content = zip_generated_code(os.path.join(project_root, generation_id))
+        artifact_store.put(generation_id, content)
+        return zip_response(content)
     except Exception as e:
         error = Error(error_code=500,
                       error_source=str(e),
@@ -75,6 +86,27 @@ def generate_app(generation_metadata: Input, response: Response):
         return error
 
 
+@app.post("/api/plan")
+def plan_app(generation_metadata: Input, response: Response):
+    """
+    Method that is triggered at the HTTP POST on the /api/plan route. Validates the input and returns the resolved
+    relationships and the manifest of the files that would be generated, without generating anything.
+
+    :param generation_metadata: the Pydantic model that represents the input (formal description of resources)
+    :param response: the response that will be sent - FastAPI specific
+    """
+    orchestrator = GenerationOrchestrator(generation_metadata, "plan", project_root)
+
+    try:
+        return orchestrator.plan()
+    except ValueError as e:
+        error = Error(error_code=400,
+                      error_source=str(e),
+                      error_reason="INVALID_INPUT").dict()
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return error
+
+
 @app.get("/api/retrieve/{generation_id}")
 def retrieve_generated_app(generation_id: str, response: Response):
     """
@@ -84,11 +116,16 @@ def retrieve_generated_app(generation_id: str, response: Response):
     downloaded first)
     :param response: the response that will be sent - FastAPI specific
     """
-    if not os.path.exists(os.path.join(project_root, generation_id)):
+    try:
+        content = artifact_store.get(generation_id)
+    except ValueError:
+        content = None
+
+    if content is None:
         error = Error(error_code=404,
                       error_source="There is no generated project with the given id.",
                       error_reason="ERROR").dict()
         response.status_code = status.HTTP_404_NOT_FOUND
         return error
     else:
-        return zip_generated_code(os.path.join(project_root, generation_id))
+        return zip_response(content)
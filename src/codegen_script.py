@@ -19,6 +19,10 @@ parser.add_argument('--python-interpreter',
                     type=str,
                     required=False,
                     choices=["python", "python3"])
+parser.add_argument('--plan',
+                    help='[Optional] Only validate the input and print the generation plan (resolved relationships '
+                         'and the files that would be generated), without generating any code.',
+                    action='store_true')
 
 
 if __name__ == "__main__":
@@ -37,11 +41,17 @@ if __name__ == "__main__":
                 metadata = json.loads(input_file.read())
                 project_root = Path(__file__).parent.parent
                 generation_metadata = Input(**metadata)
-                generation_id = str(uuid.uuid4())
-                print(f"Will generate the code into the folder {generation_id}.")
-                orchestrator = GenerationOrchestrator(generation_metadata, generation_id, project_root, interpreter)
-                orchestrator.generate()
-                print(f"Finished generating code with the ID {generation_id}.")
+
+                if args.plan:
+                    orchestrator = GenerationOrchestrator(generation_metadata, "plan", project_root, interpreter)
+                    print(json.dumps(orchestrator.plan(), indent=4))
+                else:
+                    generation_id = str(uuid.uuid4())
+                    print(f"Will generate the code into the folder {generation_id}.")
+                    orchestrator = GenerationOrchestrator(generation_metadata, generation_id, project_root,
+                                                          interpreter)
+                    orchestrator.generate()
+                    print(f"Finished generating code with the ID {generation_id}.")
             except JSONDecodeError:
                 print(f"{script_name}: error: The provided path is correct but the JSON document is invalid.")
             except ValueError:
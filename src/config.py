@@ -1,3 +1,5 @@
+import os
+
 MAX_RESOURCES_ALLOWED = 15
 MIN_STR_LENGTH = 1
 MAX_STR_LENGTH = 32
@@ -5,3 +7,17 @@ PASSWORD_LENGTH = 64
 PROJECT_DESCRIPTION_MAX_LENGTH = 512
 PROJECT_VERSION_MAX_LENGTH = 8
 MAX_WEBSITE_LENGTH = 128
+MAX_POOL_SIZE = 1000
+MAX_APP_WORKERS = 256
+
+# artifact storage (generated code archives) - see ArtifactStore.py
+ARTIFACT_STORE_BACKEND = os.environ.get("ARTIFACT_STORE_BACKEND", "local")
+ARTIFACT_STORE_DIR = os.environ.get("ARTIFACT_STORE_DIR", "artifacts")
+ARTIFACT_CACHE_DIR = os.environ.get("ARTIFACT_CACHE_DIR", "artifact_cache")
+ARTIFACT_CACHE_MAX_ENTRIES = int(os.environ.get("ARTIFACT_CACHE_MAX_ENTRIES", "64"))
+ARTIFACT_S3_BUCKET = os.environ.get("ARTIFACT_S3_BUCKET", "a-py-generator")
+ARTIFACT_S3_PREFIX = os.environ.get("ARTIFACT_S3_PREFIX", "generations/")
+ARTIFACT_S3_ENDPOINT_URL = os.environ.get("ARTIFACT_S3_ENDPOINT_URL")
+ARTIFACT_S3_REGION = os.environ.get("ARTIFACT_S3_REGION")
+ARTIFACT_S3_ACCESS_KEY = os.environ.get("ARTIFACT_S3_ACCESS_KEY")
+ARTIFACT_S3_SECRET_KEY = os.environ.get("ARTIFACT_S3_SECRET_KEY")
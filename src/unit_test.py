@@ -1,4 +1,16 @@
+import asyncio
+import copy
+import datetime
+import io
+import os
+import tempfile
 import unittest
+from GenerationOrchestrator import GenerationOrchestrator
+from RelationshipHandler import RelationshipHandler
+from IntermediateRepresentation import build_intermediate_representation
+from ArtifactStore import LocalArtifactStore, S3ArtifactStore, CachedArtifactStore
+from DockerComposeGenerator import database_tuning
+from Generator import LazyTemplate
 from mock_data import valid_resources
 from srctrueview import Input
 from config import MAX_STR_LENGTH, PASSWORD_LENGTH, PROJECT_DESCRIPTION_MAX_LENGTH, PROJECT_VERSION_MAX_LENGTH, \
@@ -6,7 +18,29 @@ from config import MAX_STR_LENGTH, PASSWORD_LENGTH, PROJECT_DESCRIPTION_MAX_LENG
 
 
 def get_input_object():
-    return {"resources": valid_resources}
+    return {"resources": copy.deepcopy(valid_resources)}
+
+
+class FakeS3Client:
+    """
+    In-memory stand-in for an S3-compatible client (only the calls used by S3ArtifactStore).
+    """
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self):
+        self.objects = {}
+        self.get_calls = 0
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):
+        self.get_calls += 1
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.NoSuchKey()
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
 
 
 def get_valid_and_invalid_str_input(max_length):
@@ -237,6 +271,280 @@ class UnitTest(unittest.TestCase):
 
         self.assertIsInstance(Input(**data), Input)
 
+    def test_connection_pool_validation(self):
+        data = get_input_object()
+        options = {
+            "database_options": {
+                "pool_size": 0
+            }
+        }
+        data["options"] = options
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["options"]["database_options"]["pool_size"] = 20
+        data["options"]["database_options"]["max_overflow"] = -1
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["options"]["database_options"]["max_overflow"] = 0
+        self.assertIsInstance(Input(**data), Input)
+
+        # unacknowledged writes could not report the duplicates
+        data["options"]["database_options"]["write_concern"] = "0"
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+    def test_targets_validation(self):
+        data = get_input_object()
+        options = {
+            "targets": []
+        }
+        data["options"] = options
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["options"]["targets"] = ["docs"]
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["options"]["targets"] = ["sql"]
+        data["options"]["database_options"] = {"db_type": "MongoDB"}
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["options"]["database_options"]["db_type"] = "MariaDB"
+        self.assertIsInstance(Input(**data), Input)
+
+    def test_target_resolution(self):
+        data = get_input_object()
+        r = RelationshipHandler(Input(**data).resources)
+        r.execute()
+        resources = build_intermediate_representation(r.resources)
+
+        def resolve(targets, db_type="MariaDB"):
+            data["options"] = {"targets": targets, "database_options": {"db_type": db_type}}
+            orchestrator = GenerationOrchestrator(Input(**data), "targets", "")
+            targets = orchestrator.resolve_targets()
+            generators = orchestrator.build_generators(resources, targets)
+            return targets, [type(generator).__name__ for generator in generators]
+
+        self.assertEqual(resolve(["models"]), (["models"], ["StructureGenerator", "SQLAlchemyGenerator"]))
+        self.assertEqual(resolve(["models"], "MongoDB"), (["models"], ["StructureGenerator", "MongoGenerator"]))
+
+        targets, generators = resolve(["routers"])
+        self.assertEqual(targets, ["models", "views", "routers"])
+        self.assertEqual(generators, ["StructureGenerator", "SQLAlchemyGenerator", "PydanticGenerator",
+                                      "FastAPIGenerator"])
+
+        # the containers need the requirements (and the SQL script that creates the tables, for MariaDB only)
+        self.assertEqual(resolve(["docker"])[0], ["models", "sql", "views", "routers", "docker", "requirements"])
+        self.assertEqual(resolve(["docker"], "MongoDB")[0], ["models", "views", "routers", "docker", "requirements"])
+
+        data["options"] = {"database_options": {"db_type": "MongoDB"}}
+        self.assertNotIn("sql", GenerationOrchestrator(Input(**data), "targets", "").resolve_targets())
+
+    def test_compression_validation(self):
+        data = get_input_object()
+        options = {
+            "compression": {
+                "enabled": True,
+                "algorithms": ["deflate"]
+            }
+        }
+        data["options"] = options
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["options"]["compression"]["algorithms"] = ["br", "gzip", "br"]
+        data["options"]["compression"]["gzip_level"] = 10
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["options"]["compression"]["gzip_level"] = 9
+        self.assertEqual(Input(**data).options.compression.algorithms, ["br", "gzip"])
+
+    def test_compression_of_empty_responses(self):
+        data = get_input_object()
+        data["options"] = {"compression": {"enabled": True, "minimum_size": 0}}
+        template = LazyTemplate(os.path.join(os.path.dirname(__file__), "..", "templates", "middleware.jinja2"))
+        middleware = {}
+        exec(template.render(resources=(), compression=Input(**data).options.compression.dict()), middleware)
+
+        def respond_with(status, body):
+            async def app(scope, receive, send):
+                await send({"type": "http.response.start", "status": status,
+                            "headers": [(b"content-length", str(len(body)).encode())]})
+                await send({"type": "http.response.body", "body": body})
+            return app
+
+        def request(app, method):
+            messages = []
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {"type": "http", "method": method, "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+            asyncio.run(middleware["CompressionMiddleware"](app)(scope, None, send))
+            return dict(messages[0]["headers"]), messages[1]["body"]
+
+        # the responses without a body are sent as they are, even with a minimum size of 0
+        for status, method, body in [(204, "GET", b""), (304, "GET", b""), (200, "GET", b""), (200, "HEAD", b"{}")]:
+            headers, sent_body = request(respond_with(status, body), method)
+            self.assertNotIn(b"content-encoding", headers)
+            self.assertEqual(sent_body, body)
+
+        headers, _ = request(respond_with(200, b"{}"), "GET")
+        self.assertEqual(headers[b"content-encoding"], b"gzip")
+
+    def test_page_tokens(self):
+        template = LazyTemplate(os.path.join(os.path.dirname(__file__), "..", "templates", "utils.jinja2"))
+        utils = {}
+        exec(template.render(resources=(), async_database=False), utils)
+        encode_page_token, decode_page_token = utils["encode_page_token"], utils["decode_page_token"]
+
+        # the identifiers that JSON cannot hold are converted back to the type of the primary key
+        token = encode_page_token(datetime.date(2022, 1, 31))
+        self.assertEqual(decode_page_token(token, "date"), datetime.date(2022, 1, 31))
+        self.assertEqual(decode_page_token(encode_page_token(5), "integer"), 5)
+        self.assertEqual(decode_page_token(encode_page_token(2.5), "decimal"), 2.5)
+
+        # a token that holds an identifier of another type is rejected
+        for token, identifier_type in [(token, "integer"), (encode_page_token(5), "date"),
+                                       (encode_page_token(True), "integer"), (encode_page_token("5"), "integer")]:
+            with self.assertRaises(ValueError):
+                decode_page_token(token, identifier_type)
+
+    def test_local_artifact_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = LocalArtifactStore(directory)
+            store.put("generation-1", b"zip")
+
+            self.assertEqual(store.get("generation-1"), b"zip")
+            self.assertIsNone(store.get("generation-2"))
+
+            with self.assertRaises(ValueError):
+                store.get("../generation-1")
+
+    def test_cached_s3_artifact_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            client = FakeS3Client()
+            writer = S3ArtifactStore("bucket", client=client)
+            store = CachedArtifactStore(S3ArtifactStore("bucket", client=client),
+                                        LocalArtifactStore(directory),
+                                        max_entries=1)
+
+            # written by another node, read through the cache
+            writer.put("generation-1", b"first")
+            self.assertEqual(store.get("generation-1"), b"first")
+            self.assertEqual(store.get("generation-1"), b"first")
+            self.assertEqual(client.get_calls, 1)
+
+            store.put("generation-2", b"second")
+            self.assertIsNone(store.cache.get("generation-1"))
+            self.assertEqual(store.get("generation-1"), b"first")
+            self.assertIsNone(store.get("generation-3"))
+
+    def test_generation_plan(self):
+        data = get_input_object()
+        data["options"] = {"targets": ["sql"]}
+        plan = GenerationOrchestrator(Input(**data), "plan", "").plan()
+
+        self.assertEqual(plan["targets"], ["sql"])
+        self.assertEqual([file["path"] for file in plan["files"]], ["create_db_and_tables.sql"])
+        self.assertGreater(plan["files"][0]["estimated_size"], 0)
+        self.assertEqual(plan["estimated_total_size"], plan["files"][0]["estimated_size"])
+        self.assertIn({"table": "Items", "field": "order_fk", "references": "Ord", "reference_field": "ordid"},
+                      plan["foreign_keys"])
+        self.assertEqual(plan["join_tables"], [])
+
+    def test_indexes(self):
+        data = get_input_object()
+        data["resources"][0]["indexes"] = [{"name": "customers_city_index",
+                                            "index_fields": [{"name": "nonexistent_field"}]}]
+
+        # indexed field does not exist in the resource
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["resources"][0]["indexes"][0]["index_fields"] = [{"name": "city"}, {"name": "zip", "descending": True}]
+        handler = RelationshipHandler(Input(**data).resources)
+        handler.execute()
+        resources = {resource.name: resource for resource in build_intermediate_representation(handler.resources)}
+
+        customer_index = resources["Customer"].indexes[0]
+        self.assertEqual([(field.name, field.descending) for field in customer_index.index_fields],
+                         [("city", False), ("zip", True)])
+        # foreign key columns are indexed automatically
+        self.assertIn("order_fk", [index.index_fields[0].name for index in resources["Item"].indexes])
+
+    def test_expansions(self):
+        handler = RelationshipHandler(Input(**get_input_object()).resources)
+        handler.execute()
+        resources = {resource.name: resource for resource in build_intermediate_representation(handler.resources)}
+
+        # the referenced resource is expanded to the referencing entities
+        customer_expansion = resources["Customer"].expansions[0]
+        self.assertEqual((customer_expansion.name, customer_expansion.many), ("ord", True))
+        self.assertEqual((customer_expansion.local_field, customer_expansion.remote_field), ("custid", "customer_fk"))
+
+        # the referencing resource is expanded to a single entity
+        order_expansion = next(x for x in resources["Order"].expansions if x.resource == "Customer")
+        self.assertEqual((order_expansion.name, order_expansion.many), ("customer", False))
+        self.assertEqual((order_expansion.local_field, order_expansion.remote_field), ("customer_fk", "custid"))
+
+    def test_local_cache_validation(self):
+        data = get_input_object()
+        data["resources"][1]["options"] = {"local_cache_for": 5}
+
+        # the in-process cache is layered over the API cache
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["resources"][1]["options"] = {"api_caching_enabled": True, "cache_for": 10, "local_cache_for": 20}
+
+        # the in-process entries cannot outlive the cached responses
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["resources"][1]["options"]["local_cache_for"] = 5
+        self.assertEqual(Input(**data).resources[1].options.local_cache_for, 5)
+
+
+    def test_database_tuning(self):
+        data = get_input_object()
+        data["options"] = {"database_options": {"expected_app_workers": 4}}
+
+        # the server keeps its defaults unless a data size or a memory budget is given
+        self.assertIsNone(database_tuning(Input(**data).options.database_options))
+
+        data["options"]["database_options"].update({"memory_budget_mb": 4096, "expected_data_size_mb": 1000})
+        tuning = database_tuning(Input(**data).options.database_options)
+        self.assertEqual(tuning["innodb_buffer_pool_size"], 1250)
+        self.assertEqual(tuning["max_connections"], 4 * (5 + 10) + 10)
+
+        # the production server runs one worker per CPU, the database has to know how many of them there are
+        data["options"]["deployment_profile"] = "production"
+        self.assertIsInstance(Input(**data), Input)
+        del data["options"]["database_options"]["expected_app_workers"]
+
+        with self.assertRaises(ValueError):
+            Input(**data)
+
+        data["options"]["database_options"]["expected_app_workers"] = 4
+
+        data["options"]["database_options"]["db_type"] = "MongoDB"
+        del data["options"]["database_options"]["expected_data_size_mb"]
+        tuning = database_tuning(Input(**data).options.database_options)
+        self.assertEqual(tuning["wired_tiger_cache_size_gb"], 1.5)
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,16 +1,32 @@
 import os
 
 
-def correct_pipreqs_output(project_root: str, generation_id: str, db_type: str):
+def correct_pipreqs_output(project_root: str, generation_id: str, db_type: str, async_database: bool = False,
+                           fast_json_responses: bool = False, compression_algorithms: tuple = (),
+                           production: bool = False):
     """
     Workaround method that is used to add missing requirements and to correct wrongly generated ones.
+    The database drivers are only referenced through the connection string and orjson is only imported by FastAPI,
+    so pipreqs cannot detect them. The compression libraries are imported under names that differ from the names of
+    their packages. The production server (gunicorn, with uvloop and httptools) is only referenced by the Dockerfile.
     """
     requirements_txt = os.path.join(project_root, generation_id, "src", "requirements.txt")
     with open(requirements_txt, "r") as f:
         content = f.read()
         content = content.replace("fastapi_cache==0.1.0", "fastapi-cache2==0.1.8")
-        if db_type == "MariaDB":
+        if db_type == "MariaDB" and async_database:
+            content += "aiomysql==0.1.1"
+        elif db_type == "MariaDB":
             content += "mysql-connector-python==8.0.27"
+        if fast_json_responses and "orjson" not in content:
+            content += "orjson==3.8.5" if content.endswith("\n") else "\norjson==3.8.5"
+        for algorithm, requirement in [("br", "Brotli==1.0.9"), ("zstd", "zstandard==0.21.0")]:
+            package = requirement.split("==")[0]
+            if algorithm in compression_algorithms and package.lower() not in content.lower():
+                content += requirement if content.endswith("\n") else f"\n{requirement}"
+        for requirement in ["gunicorn==20.1.0", "uvloop==0.17.0", "httptools==0.5.0"] if production else []:
+            if requirement.split("==")[0] not in content:
+                content += requirement if content.endswith("\n") else f"\n{requirement}"
 
     with open(requirements_txt, "w") as f:
         f.write(content)
\ No newline at end of file
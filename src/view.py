@@ -1,8 +1,8 @@
-from pydantic import BaseModel, constr, validator, Extra, Field
+from pydantic import BaseModel, constr, conint, conlist, validator, Extra, Field
 from typing import List, Optional, Literal
 from keyword import iskeyword
 from config import MAX_RESOURCES_ALLOWED, MAX_STR_LENGTH, PASSWORD_LENGTH, PROJECT_DESCRIPTION_MAX_LENGTH, \
-    PROJECT_VERSION_MAX_LENGTH, MAX_WEBSITE_LENGTH
+    PROJECT_VERSION_MAX_LENGTH, MAX_WEBSITE_LENGTH, MAX_POOL_SIZE, MAX_APP_WORKERS
 
 
 def generic_alphanumeric_validator(element: str, element_name: str) -> None:
@@ -80,6 +80,16 @@ class Unique(BaseModel, extra=Extra.forbid):
     unique_fields: List[constr(min_length=1, max_length=MAX_STR_LENGTH)]
 
 
+class IndexField(BaseModel, extra=Extra.forbid):
+    name: constr(min_length=1, max_length=MAX_STR_LENGTH)
+    descending: bool = Field(default=False)
+
+
+class Index(BaseModel, extra=Extra.forbid):
+    name: constr(min_length=1, max_length=MAX_STR_LENGTH)
+    index_fields: conlist(IndexField, min_items=1)
+
+
 class Relationship(BaseModel, extra=Extra.forbid):
     type: Literal["ONE-TO-ONE", "ONE-TO-MANY", "MANY-TO-MANY"]
     table: constr(min_length=1, max_length=MAX_STR_LENGTH)
@@ -97,6 +107,30 @@ class DatabaseOptions(BaseModel, extra=Extra.forbid):
     db_type: Literal["MariaDB", "MongoDB"] = Field(default="MariaDB")
     db_username: Optional[constr(min_length=1, max_length=MAX_STR_LENGTH)] = Field(default="root")
     db_password: Optional[constr(min_length=1, max_length=PASSWORD_LENGTH)] = Field(default="generated_password")
+    pool_size: conint(ge=1, le=MAX_POOL_SIZE) = Field(default=5)
+    max_overflow: conint(ge=0, le=MAX_POOL_SIZE) = Field(default=10)
+    pool_recycle: conint(ge=-1) = Field(default=3600)
+    pool_pre_ping: bool = Field(default=True)
+    warm_up_pool: bool = Field(default=True)
+    statement_timeout_ms: Optional[conint(ge=1)]
+    echo_sql: bool = Field(default=False)
+    expected_data_size_mb: Optional[conint(ge=1)]
+    memory_budget_mb: Optional[conint(ge=256)]
+    expected_app_workers: conint(ge=1, le=MAX_APP_WORKERS) = Field(default=1)
+    connect_timeout_ms: conint(ge=1) = Field(default=5000)
+    server_selection_timeout_ms: conint(ge=1) = Field(default=5000)
+    socket_timeout_ms: Optional[conint(ge=1)]
+    # unacknowledged writes (w=0) are not offered: the duplicates could not be reported (409) to the clients
+    write_concern: Literal["1", "majority"] = Field(default="1")
+    read_preference: Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"] = \
+        Field(default="primary")
+
+    @property
+    def server_tuning_enabled(self) -> bool:
+        """
+        Whether the database server is sized for the expected data size and the memory budget (docker-compose.yml).
+        """
+        return self.memory_budget_mb is not None or self.expected_data_size_mb is not None
 
 
 class ProjectMetadata(BaseModel, extra=Extra.forbid):
@@ -108,11 +142,35 @@ class ProjectMetadata(BaseModel, extra=Extra.forbid):
     creator_website: constr(min_length=1, max_length=MAX_WEBSITE_LENGTH) = Field(default="")
 
 
+class CompressionOptions(BaseModel, extra=Extra.forbid):
+    enabled: bool = Field(default=False)
+    # in order of preference, when a client accepts several of them
+    algorithms: conlist(Literal["gzip", "br", "zstd"], min_items=1) = Field(default=["gzip"])
+    minimum_size: conint(ge=0) = Field(default=1000)
+    gzip_level: conint(ge=1, le=9) = Field(default=6)
+    brotli_quality: conint(ge=0, le=11) = Field(default=4)
+    zstd_level: conint(ge=1, le=22) = Field(default=3)
+
+    @validator("algorithms")
+    def validate_algorithms(cls, algorithms):
+        return list(dict.fromkeys(algorithms))
+
+
+GenerationTarget = Literal["models", "sql", "views", "routers", "docker", "requirements"]
+
+
 class Options(BaseModel, extra=Extra.forbid):
     database_options: Optional[DatabaseOptions] = Field(default=DatabaseOptions())
     project_metadata: Optional[ProjectMetadata] = Field(default=ProjectMetadata())
     run_main_app_in_container: bool = Field(default=True)
     application_port: int = Field(default=5555)
+    targets: Optional[List[GenerationTarget]]
+    lazy_loading: bool = Field(default=False)
+    async_database: bool = Field(default=False)
+    fast_json_responses: bool = Field(default=False)
+    compression: Optional[CompressionOptions] = Field(default=CompressionOptions())
+    deployment_profile: Literal["development", "production"] = Field(default="development")
+    slim_container_image: bool = Field(default=False)
 
     @validator("application_port")
     def validate_port(cls, application_port):
@@ -122,10 +180,39 @@ class Options(BaseModel, extra=Extra.forbid):
             raise ValueError(f"Please provide a positive number for the port.")
         return application_port
 
+    @validator("deployment_profile")
+    def validate_deployment_profile(cls, deployment_profile, values):
+        db_options = values.get("database_options")
+        tuned = db_options is not None and db_options.db_type == "MariaDB" and db_options.server_tuning_enabled
+
+        # the connections accepted by the tuned database server depend on the number of workers of the application
+        if deployment_profile == "production" and tuned and "expected_app_workers" not in db_options.__fields_set__:
+            raise ValueError("Please provide the 'expected_app_workers' of the database options, the production "
+                             "server runs one worker per CPU (at most 'expected_app_workers').")
+
+        return deployment_profile
+
+    @validator("targets")
+    def validate_targets(cls, targets, values):
+        if targets is None:
+            return targets
+
+        if len(targets) == 0:
+            raise ValueError("Please provide at least one generation target or omit the field entirely.")
+
+        db_options = values.get("database_options")
+        if "sql" in targets and db_options is not None and db_options.db_type != "MariaDB":
+            raise ValueError("The 'sql' generation target is only available for MariaDB.")
+
+        return list(dict.fromkeys(targets))
+
 
 class ResourceOptions(BaseModel, extra=Extra.forbid):
     api_caching_enabled: Optional[bool] = Field(default=False)
     cache_for: Optional[int] = Field(default=60)
+    local_cache_for: Optional[int] = Field(default=None)
+    pagination: Literal["offset", "keyset"] = Field(default="offset")
+    hypermedia: Literal["all", "item", "none"] = Field(default="all")
 
     @validator("cache_for")
     def validate_caching_time(cls, cache_for):
@@ -134,6 +221,19 @@ class ResourceOptions(BaseModel, extra=Extra.forbid):
                              " and for a minimum of one second.")
         return cache_for
 
+    @validator("local_cache_for")
+    def validate_local_caching_time(cls, local_cache_for, values):
+        if local_cache_for is None:
+            return local_cache_for
+
+        if not values.get("api_caching_enabled"):
+            raise ValueError("The in-process cache of a resource requires API caching to be enabled.")
+
+        if local_cache_for < 1 or local_cache_for > values.get("cache_for", 60):
+            raise ValueError("A resource can be cached in-process for a minimum of one second"
+                             " and for a maximum of its 'cache_for' time.")
+        return local_cache_for
+
 
 class Resource(BaseModel, extra=Extra.forbid):
     name: constr(min_length=1, max_length=MAX_STR_LENGTH)
@@ -141,6 +241,7 @@ class Resource(BaseModel, extra=Extra.forbid):
     fields: List[ResourceField]
     primary_key: constr(min_length=1, max_length=MAX_STR_LENGTH)
     uniques: Optional[List[Unique]]
+    indexes: Optional[List[Index]]
     relationships: Optional[List[Relationship]]
     foreign_keys: Optional[List[ForeignKey]]
     options: Optional[ResourceOptions] = Field(default=ResourceOptions())
@@ -214,6 +315,31 @@ class Resource(BaseModel, extra=Extra.forbid):
                     raise ValueError(f"Please make sure that there are no duplicate unique pairs in the input.")
         return v
 
+    @validator('indexes')
+    def index_fields_must_be_in_fields(cls, v, values):
+        if "fields" not in values:
+            return v
+
+        fieldnames = [field.name.lower() for field in values["fields"]]
+
+        for index in v:
+            generic_alphanumeric_and_keyword_validator(index.name, 'index name')
+            for index_field in index.index_fields:
+                if index_field.name.lower() not in fieldnames:
+                    raise ValueError(f"Index `{index.name}` contains a field that was not declared:"
+                                     f" `{index_field.name}`")
+        return v
+
+    @validator('indexes')
+    def index_names_must_not_have_duplicates(cls, v, values):
+        # indexes and unique constraints share the same namespace in the database
+        index_names = [index.name.lower() for index in v]
+        index_names.extend(unique.name.lower() for unique in values.get("uniques") or [])
+
+        if len(set(index_names)) != len(index_names):
+            raise ValueError(f"Please make sure that the names of the indexes and uniques are not duplicated!")
+        return v
+
 
 class Input(BaseModel, extra=Extra.forbid):
     resources: List[Resource]